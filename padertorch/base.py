@@ -237,7 +237,8 @@ class Model(Module, Configurable, abc.ABC):
         This method is primarily used by SummaryHook before dumping a summary.
         Summary contains accumulated values from multiple reviews (lists in
         "buffers", "scalars" and "histograms", snapshots in "snapshots",
-        "audios" and "images").
+        "audios" and "images"). The lists of "histograms" contain at most the
+        last 1M values.
         This, e.g., allows to accurately compute and add metrics based on
         other scalars such as F-scores or Error Rates.
         The intermediate formats "buffers" and "snapshots" make no assumption
@@ -262,7 +263,11 @@ class Model(Module, Configurable, abc.ABC):
            any entries by the end of modify_summary.
         """
         for key, scalar in summary['scalars'].items():
-            summary['scalars'][key] = np.mean(scalar)
+            if isinstance(scalar, list) and len(scalar) > 0:
+                # Cheaper than np.mean, that converts the list to an array.
+                summary['scalars'][key] = sum(scalar) / len(scalar)
+            else:
+                summary['scalars'][key] = np.mean(scalar)
 
         assert len(
             summary['buffers']) == 0, "intermediate format buffers has to be converted during modify_summary"
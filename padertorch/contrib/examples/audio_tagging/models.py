@@ -281,9 +281,10 @@ class CRNN(Model):
         if config['cnn_2d'] is not None and input_size is not None:
             config['cnn_2d']['in_channels'] = 1
             in_channels = config['cnn_2d']['in_channels']
-            cnn_2d = config['cnn_2d']['factory'].from_config(config['cnn_2d'])
-            output_size = cnn_2d.get_shapes((1, in_channels, input_size, 1000))[-1][2]
-            input_size = cnn_2d.out_channels[-1] * output_size
+            output_size = config['cnn_2d']['factory'].get_shapes_from_config(
+                config['cnn_2d'], (1, in_channels, input_size, 1000)
+            )[-1][2]
+            input_size = config['cnn_2d']['out_channels'][-1] * output_size
 
         if config['cnn_1d'] is not None:
             if input_size is not None:
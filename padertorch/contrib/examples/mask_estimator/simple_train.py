@@ -46,6 +46,11 @@ class SimpleMaskEstimator(pt.Model):
         """
         super().__init__()
         self.num_features = num_features
+        # Same parameters as the default of pb.transform.stft, which is used
+        # for the targets in change_example_structure.
+        self.stft = pt.ops.STFT(
+            size=2 * (num_features - 1), complex_representation='stacked'
+        )
         self.net = torch.nn.Sequential(
             torch.nn.Dropout(dropout),
             torch.nn.Linear(num_features, num_units),
@@ -60,10 +65,12 @@ class SimpleMaskEstimator(pt.Model):
         )
 
     def forward(self, batch):
-
-        x = batch['observation_abs']
+        # The STFT is calculated on the same device as the network, so only
+        # the time signal has to be transferred.
+        x = torch.norm(self.stft(batch['observation']), dim=-1)
         out = self.net(x)
         return dict(
+            observation_abs=x,
             speech_mask_prediction=out[..., :self.num_features],
             noise_mask_prediction=out[..., self.num_features:],
         )
@@ -80,7 +87,7 @@ class SimpleMaskEstimator(pt.Model):
 
     def add_images(self, batch, output):
         speech_mask = output['speech_mask_prediction']
-        observation = batch['observation_abs']
+        observation = output['observation_abs']
         images = dict()
         images['speech_mask'] = mask_to_image(speech_mask, True)
         images['observed_stft'] = stft_to_image(observation, True)
@@ -101,10 +108,8 @@ def change_example_structure(example):
     stft = pb.transform.stft
     audio_data = example[K.AUDIO_DATA]
     net_input = dict()
-    net_input['observation_stft'] = stft(
-        audio_data[K.OBSERVATION]).astype(np.complex64)
-    net_input['observation_abs'] = np.abs(
-        net_input['observation_stft']).astype(np.float32)
+    # The STFT of the observation is calculated in SimpleMaskEstimator.forward
+    net_input['observation'] = audio_data[K.OBSERVATION].astype(np.float32)
     speech_image = stft(audio_data[K.SPEECH_IMAGE])
     noise_image = stft(audio_data[K.NOISE_IMAGE])
     target_mask, noise_mask = biased_binary_mask(
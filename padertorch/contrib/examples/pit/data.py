@@ -1,6 +1,5 @@
 from functools import partial
 
-import einops
 import numpy as np
 
 import paderbox as pb
@@ -49,10 +48,14 @@ def read_audio(example, src_key="audio_path", audio_keys=None):
 def pre_batch_transform(inputs, return_keys=None):
     s = inputs['audio_data']['speech_source']
     y = inputs['audio_data']['observation']
-    S = stft(s, 512, 128)
-    Y = stft(y, 512, 128)
-    Y = einops.rearrange(Y, 't f -> t f')
-    S = einops.rearrange(S, 'k t f -> t k f')
+    # Convert once to contiguous complex64, so that all derived features
+    # (abs, phase difference, mask) are directly contiguous float32 arrays
+    # and the np.ascontiguousarray calls below do not need to copy.
+    S = np.ascontiguousarray(
+        stft(s, 512, 128).transpose(1, 0, 2),  # 'k t f -> t k f'
+        np.complex64,
+    )
+    Y = np.ascontiguousarray(stft(y, 512, 128), np.complex64)
     X = S  # Same for WSJ0_2MIX database
     num_frames = Y.shape[0]
 
@@ -67,12 +70,21 @@ def pre_batch_transform(inputs, return_keys=None):
     maybe_add('S', np.ascontiguousarray(S, np.float32))
     maybe_add('y', np.ascontiguousarray(y, np.float32))
     maybe_add('Y', np.ascontiguousarray(Y, np.complex64))
-    maybe_add('X_abs', np.ascontiguousarray(np.abs(X), np.float32))
-    maybe_add('Y_abs', np.ascontiguousarray(np.abs(Y), np.float32))
+    X_abs = np.abs(X)
+    Y_abs = np.abs(Y)
+    maybe_add('X_abs', np.ascontiguousarray(X_abs, np.float32))
+    maybe_add('Y_abs', np.ascontiguousarray(Y_abs, np.float32))
     maybe_add('num_frames', num_frames)
+    # cos(angle(Y) - angle(X)) = real(Y * conj(X)) / |Y * conj(X)|
+    # avoids the two arctan2 calls of np.angle and the cos.
+    # The product is computed in double precision, because |Y| * |X| of
+    # near silent bins underflows in single precision. With the magnitude
+    # of the same product as denominator, the value stays in [-1, 1].
+    YX = Y[:, None, :].astype(np.complex128) * np.conj(X)
     maybe_add('cos_phase_difference', np.ascontiguousarray(
-        np.cos(np.angle(Y[:, None, :]) - np.angle(X)), np.float32)
-    )
+        YX.real / np.maximum(np.abs(YX), np.finfo(np.float64).tiny),
+        np.float32
+    ))
 
     return return_dict
 
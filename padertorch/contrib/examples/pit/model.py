@@ -1,4 +1,3 @@
-import einops
 import torch
 from torch.nn.utils.rnn import PackedSequence
 
@@ -102,8 +101,9 @@ class PermutationInvariantTrainingModel(pt.Model):
         h_data = self.output_activation(h_data)
         h = PackedSequence(h_data, h.batch_sizes)
 
+        # 'tb (k f) -> tb k f'
         mask = PackedSequence(
-            einops.rearrange(h.data, 'tb (k f) -> tb k f', k=self.K),
+            h.data.view(h.data.size(0), self.K, -1),
             h.batch_sizes,
         )
         return pt.ops.unpack_sequence(mask)
@@ -111,26 +111,21 @@ class PermutationInvariantTrainingModel(pt.Model):
     def review(self, batch, model_out):
 
         pit_mse_loss = list()
-        for mask, observation, target in zip(
-                model_out,
-                batch['Y_abs'],
-                batch['X_abs']
-        ):
-            pit_mse_loss.append(pt.ops.losses.pit_loss(
-                mask * observation[:, None, :],
-                target,
-                axis=-2
-            ))
-        # Ideal Phase Sensitive loss
-        pit_ips_loss = list()
+        pit_ips_loss = list()  # Ideal Phase Sensitive loss
         for mask, observation, target, cos_phase_diff in zip(
             model_out,
             batch['Y_abs'],
             batch['X_abs'],
             batch['cos_phase_difference']
         ):
+            estimation = mask * observation[:, None, :]
+            pit_mse_loss.append(pt.ops.losses.pit_loss(
+                estimation,
+                target,
+                axis=-2
+            ))
             pit_ips_loss.append(pt.ops.losses.pit_loss(
-                mask * observation[:, None, :],
+                estimation,
                 target * cos_phase_diff,
                 axis=-2
             ))
@@ -140,13 +135,24 @@ class PermutationInvariantTrainingModel(pt.Model):
                 'pit_ips_loss': torch.mean(torch.stack(pit_ips_loss)),
         }
 
+        # The images are only rendered in modify_summary, i.e. once per
+        # summary and not for every review.
         b = 0   # only print image of first example in a batch
         images = dict()
-        images['observation'] = stft_to_image(batch['Y_abs'][b])
+        images['observation'] = batch['Y_abs'][b].detach()
         for i in range(model_out[b].shape[1]):
-            images[f'mask_{i}'] = mask_to_image(model_out[b][:, i, :])
-            images[f'estimation_{i}'] = stft_to_image(batch['X_abs'][b][:, 0, :])
+            images[f'mask_{i}'] = model_out[b][:, i, :].detach()
+            images[f'estimation_{i}'] = batch['X_abs'][b][:, 0, :].detach()
 
         return dict(losses=losses,
                     images=images
                     )
+
+    def modify_summary(self, summary):
+        for key, image in summary['images'].items():
+            if key.startswith('mask_'):
+                summary['images'][key] = mask_to_image(image)
+            else:
+                summary['images'][key] = stft_to_image(image)
+        summary = super().modify_summary(summary)
+        return summary
@@ -318,25 +318,55 @@ class _Conv(Module):
         Returns:
 
         """
-        out_shape = np.array(in_shape)
-        assert len(out_shape) == 3 + self.is_2d(), (
-            len(out_shape), self.is_2d()
-        )
         assert in_shape[1] == self.in_channels, (
             in_shape[1], self.in_channels
         )
-        out_shape[1] = self.out_channels
-        if self.is_transpose():
+        return self.compute_out_shape(
+            in_shape, self.out_channels, self.kernel_size,
+            dilation=self.dilation, stride=self.stride, pad_side=self.pad_side
+        )
+
+    @classmethod
+    def compute_out_shape(
+            cls, in_shape, out_channels, kernel_size,
+            dilation=1, stride=1, pad_side='both'
+    ):
+        """
+        compute output shape given input shape and layer hyper parameters
+        without instantiating the layer.
+
+        Args:
+            in_shape: input shape
+            out_channels:
+            kernel_size:
+            dilation:
+            stride:
+            pad_side:
+
+        Returns:
+
+        """
+        if cls.is_2d():
+            pad_side = to_pair(pad_side)
+            kernel_size = to_pair(kernel_size)
+            dilation = to_pair(dilation)
+            stride = to_pair(stride)
+        out_shape = np.array(in_shape)
+        assert len(out_shape) == 3 + cls.is_2d(), (
+            len(out_shape), cls.is_2d()
+        )
+        out_shape[1] = out_channels
+        if cls.is_transpose():
             raise NotImplementedError
         else:
             out_shape_ = out_shape[2:] - (
-                np.array(self.dilation) * (np.array(self.kernel_size) - 1)
+                np.array(dilation) * (np.array(kernel_size) - 1)
             )
             out_shape[2:] = np.where(
-                [pad is None for pad in to_list(self.pad_side)],
+                [pad is None for pad in to_list(pad_side)],
                 out_shape_, out_shape[2:]
             )
-            out_shape[2:] = np.ceil(out_shape[2:]/np.array(self.stride))
+            out_shape[2:] = np.ceil(out_shape[2:]/np.array(stride))
         return out_shape.astype(np.int64)
 
     def get_seq_len_out(self, seq_len_in):
@@ -778,18 +808,72 @@ class _CNN(Module):
 
     def get_shapes(self, in_shape):
         assert in_shape[1] == self.in_channels, (in_shape[1], self.in_channels)
+        return self._compute_shapes(
+            in_shape, self.layer_in_channels, self.kernel_sizes,
+            self.dilations, self.strides, self.pad_sides,
+            self.pool_types, self.pool_sizes,
+        )
+
+    @classmethod
+    def get_shapes_from_config(cls, config, in_shape):
+        """
+        Same as get_shapes, but computes the shapes from the config, i.e.,
+        without instantiating (and initializing) all layers. Useful in
+        finalize_dogmatic_config.
+
+        Args:
+            config: config of this class
+            in_shape: input shape
+
+        Returns:
+
+        """
+        assert in_shape[1] == config['in_channels'], (
+            in_shape[1], config['in_channels']
+        )
+        num_layers = len(config['out_channels'])
+        layer_in_channels = (
+            [config['in_channels']] + copy(config['out_channels'])
+        )
+        dense_connections = to_list(config['dense_connections'], num_layers)
+        for i, destination_idx in enumerate(dense_connections):
+            if destination_idx is not None:
+                for dst_idx in to_list(destination_idx):
+                    layer_in_channels[dst_idx] += layer_in_channels[i]
+        return cls._compute_shapes(
+            in_shape, layer_in_channels,
+            to_list(config['kernel_size'], num_layers),
+            to_list(config['dilation'], num_layers),
+            to_list(config['stride'], num_layers),
+            to_list(config['pad_side'], num_layers),
+            to_list(config['pool_type'], num_layers),
+            to_list(config['pool_size'], num_layers),
+        )
+
+    @classmethod
+    def _compute_shapes(
+            cls, in_shape, layer_in_channels, kernel_sizes, dilations,
+            strides, pad_sides, pool_types, pool_sizes
+    ):
         out_shape = in_shape
         shapes = [in_shape]
-        for i, conv in enumerate(self.convs):
-            out_shape = conv.get_out_shape(out_shape)
-            out_shape[1] = self.layer_in_channels[i + 1]  # has to be adjusted with dense skip connections
-            if self.pool_types[i] is not None:
-                if self.is_transpose():
+        for i in range(len(kernel_sizes)):
+            out_shape = cls.conv_cls.compute_out_shape(
+                out_shape,
+                # has to be adjusted with dense skip connections
+                layer_in_channels[i + 1],
+                kernel_sizes[i],
+                dilation=dilations[i],
+                stride=strides[i],
+                pad_side=pad_sides[i],
+            )
+            if pool_types[i] is not None:
+                if cls.is_transpose():
                     raise NotImplementedError
                 else:
-                    out_shape_ = out_shape[2:] / np.array(self.pool_sizes[i])
+                    out_shape_ = out_shape[2:] / np.array(pool_sizes[i])
                     out_shape[2:] = np.where(
-                        [pad is None for pad in to_list(self.pad_sides[i])],
+                        [pad is None for pad in to_list(pad_sides[i])],
                         np.floor(out_shape_), np.ceil(out_shape_)
                     )
             shapes.append(out_shape)
@@ -1,10 +1,11 @@
+import numpy as np
 import torch
-from einops import rearrange
 from padertorch import Module
 from padertorch.contrib.je.modules.conv import (
     CNN2d, CNN1d, CNNTranspose2d, CNNTranspose1d
 )
 from padertorch.modules.fully_connected import fully_connected_stack
+from padertorch.utils import to_numpy
 from torch import nn
 from torch.nn.utils.rnn import pack_padded_sequence, pad_packed_sequence
 
@@ -37,7 +38,8 @@ class HybridCNN(Module):
         else:
             x, seq_len = self.cnn_2d(x, seq_len)
             pool_indices_2d = None
-        x = rearrange(x, 'b c f t -> b (c f) t')
+        # 'b c f t -> b (c f) t'
+        x = x.reshape(x.shape[0], -1, x.shape[-1])
         if self.cnn_1d.return_pool_indices:
             x, seq_len, pool_indices_1d = self.cnn_1d(
                 x, seq_len=seq_len
@@ -63,8 +65,10 @@ class HybridCNN(Module):
             'return_pool_indices': config['return_pool_indices']
         }
         if config['input_size'] is not None:
-            cnn_2d = config['cnn_2d']['factory'].from_config(config['cnn_2d'])
-            _, out_channels, output_size, _ = cnn_2d.get_shapes((1, config['cnn_2d']['in_channels'], config['input_size'], 1000))[-1]
+            _, out_channels, output_size, _ = config['cnn_2d']['factory'].get_shapes_from_config(
+                config['cnn_2d'],
+                (1, config['cnn_2d']['in_channels'], config['input_size'], 1000)
+            )[-1]
             config['cnn_1d']['in_channels'] = out_channels * output_size
 
     @classmethod
@@ -124,7 +128,9 @@ class HybridCNNTranspose(Module):
             seq_lens=lengths_1d,
             pool_indices=pool_indices_1d,
         )
-        x = x.view(
+        # 'b (c f) t -> b c f t'
+        # view needs a contiguous tensor, so make a possible copy explicit.
+        x = x.contiguous().view(
             (x.shape[0], self.cnn_transpose_2d.in_channels, -1, x.shape[-1])
         )
         x, seq_len = self.cnn_transpose_2d(
@@ -176,6 +182,9 @@ class CRNN(Module):
             post_rnn_pooling=None, input_size=None
     ):
         super().__init__()
+        if rnn is not None and not isinstance(rnn, nn.RNNBase):
+            # Checked once here instead of in every call of self.rnn
+            raise NotImplementedError(type(rnn))
         self.input_size = input_size
         self._cnn_2d = cnn_2d
         self._cnn_1d = cnn_1d
@@ -188,7 +197,8 @@ class CRNN(Module):
             x, seq_len = self._cnn_2d(x, seq_len)
         if x.dim() != 3:
             assert x.dim() == 4
-            x = rearrange(x, 'b c f t -> b (c f) t')
+            # 'b c f t -> b (c f) t'
+            x = x.reshape(x.shape[0], -1, x.shape[-1])
         return x, seq_len
 
     def cnn_1d(self, x, seq_len=None):
@@ -198,23 +208,37 @@ class CRNN(Module):
 
     def rnn(self, x, seq_len=None):
         if self._rnn is None:
-            x = rearrange(x, 'b f t -> b t f')
-        elif isinstance(self._rnn, nn.RNNBase):
+            x = x.transpose(1, 2)  # 'b f t -> b t f'
+        else:
             if self._rnn.batch_first:
-                x = rearrange(x, 'b f t -> b t f')
+                x = x.transpose(1, 2)  # 'b f t -> b t f'
             else:
-                x = rearrange(x, 'b f t -> t b f')
-            if seq_len is not None:
+                x = x.permute(2, 0, 1)  # 'b f t -> t b f'
+            # Materialize the transposed layout once, so that neither
+            # pack_padded_sequence nor the (cuDNN) RNN have to copy the
+            # strided view.
+            x = x.contiguous()
+            num_frames = x.shape[1] if self._rnn.batch_first else x.shape[0]
+            # Without padding, packing and unpacking does not change the
+            # output and can be skipped.
+            packed = (
+                seq_len is not None
+                and not np.all(np.asarray(seq_len) == num_frames)
+            )
+            if packed:
+                lengths = np.asarray(seq_len).astype(np.int64)
+                assert np.all(lengths == seq_len), (
+                    'pack_padded_sequence needs integer sequence lengths',
+                    seq_len
+                )
                 x = pack_padded_sequence(
-                    x, seq_len, batch_first=self._rnn.batch_first
+                    x, lengths, batch_first=self._rnn.batch_first
                 )
             x, _ = self._rnn(x)
-            if seq_len is not None:
+            if packed:
                 x = pad_packed_sequence(x, batch_first=self._rnn.batch_first)[0]
             if not self._rnn.batch_first:
-                x = rearrange(x, 't b f -> b t f')
-        else:
-            raise NotImplementedError
+                x = x.transpose(0, 1)  # 't b f -> b t f'
         return x
 
     def post_rnn_pooling(self, x, seq_len):
@@ -228,6 +252,12 @@ class CRNN(Module):
         return x
 
     def forward(self, x, seq_len=None):
+        if seq_len is not None:
+            # The CNNs process the sequence lengths with numpy and
+            # pack_padded_sequence needs them on the cpu, hence convert them
+            # once to a cpu array (e.g. no device sync per layer). The dtype
+            # is kept, because the CNNs round fractional lengths.
+            seq_len = np.asarray(to_numpy(seq_len))
         x, seq_len = self.cnn_2d(x, seq_len)
         x, seq_len = self.cnn_1d(x, seq_len)
         x = self.rnn(x, seq_len=seq_len)
@@ -246,9 +276,10 @@ class CRNN(Module):
         input_size = config[cls.input_size_key]
         if config['cnn_2d'] is not None and input_size is not None:
             in_channels = config['cnn_2d']['in_channels']
-            cnn_2d = config['cnn_2d']['factory'].from_config(config['cnn_2d'])
-            output_size = cnn_2d.get_shapes((1, in_channels, input_size, 1000))[2]
-            input_size = cnn_2d.out_channels[-1] * output_size
+            output_size = config['cnn_2d']['factory'].get_shapes_from_config(
+                config['cnn_2d'], (1, in_channels, input_size, 1000)
+            )[-1][2]
+            input_size = config['cnn_2d']['out_channels'][-1] * output_size
 
         if config['cnn_1d'] is not None:
             if input_size is not None:
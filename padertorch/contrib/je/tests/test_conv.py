@@ -1,3 +1,4 @@
+import pytest
 import torch
 import numpy as np
 from padertorch.contrib.je.modules.conv import Conv1d, ConvTranspose1d
@@ -388,3 +389,71 @@ def test_get_transpose_config():
     assert transpose_config == expected_transpose_config
     transpose_transpose_config = HybridCNNTranspose.get_transpose_config(transpose_config)
     assert transpose_transpose_config == config
+
+
+def run_shapes_from_config_sweep(in_shape, cls, kwargs_sweep):
+    for kwargs in sweep(kwargs_sweep):
+        config = cls.get_config(kwargs)
+        shapes = cls.get_shapes_from_config(config, in_shape)
+        expected_shapes = cls.from_config(config).get_shapes(in_shape)
+        shapes = [tuple(shape) for shape in shapes]
+        expected_shapes = [tuple(shape) for shape in expected_shapes]
+        assert shapes == expected_shapes, (shapes, expected_shapes, kwargs)
+
+
+def test_shapes_from_config_1d():
+    for num_frames in [129, 140]:
+        x = get_input_1d(num_frames)
+        run_shapes_from_config_sweep(
+            x.shape,
+            CNN1d,
+            [
+                ('in_channels', [x.shape[1]]),
+                ('out_channels', [2*[16] + [10]]),
+                ('kernel_size', [3, [3, 5, 1]]),
+                ('stride', [1, 2]),
+                ('pool_type', ['max', None]),
+                ('pool_size', [1, 2]),
+                ('pad_side', ['both', None]),
+                ('dense_connections', [None, [[1], [2], None]]),
+            ]
+        )
+
+
+def test_shapes_from_config_2d():
+    for num_frames, num_features in zip(
+            [129, 140],
+            [140, 129]
+    ):
+        x = get_input_2d(num_frames, num_features)
+        run_shapes_from_config_sweep(
+            x.shape,
+            CNN2d,
+            [
+                ('in_channels', [x.shape[1]]),
+                ('out_channels', [2*[16] + [10]]),
+                ('kernel_size', [3, [3, (5, 3), 1]]),
+                ('stride', [1, 2, (2, 1)]),
+                ('pool_type', ['max', None]),
+                ('pool_size', [1, 2]),
+                ('pad_side', ['both', None, 3*[(None, 'both')]]),
+                ('dense_connections', [None, [[1], [2], None]]),
+            ]
+        )
+
+
+def test_shapes_from_config_transpose():
+    for cls, x in [
+        (CNNTranspose1d, get_input_1d()),
+        (CNNTranspose2d, get_input_2d()),
+    ]:
+        config = cls.get_config({
+            'in_channels': x.shape[1],
+            'out_channels': 2*[16] + [10],
+            'kernel_size': 3,
+        })
+        # Both paths do not support transposed convolutions.
+        with pytest.raises(NotImplementedError):
+            cls.from_config(config).get_shapes(x.shape)
+        with pytest.raises(NotImplementedError):
+            cls.get_shapes_from_config(config, x.shape)
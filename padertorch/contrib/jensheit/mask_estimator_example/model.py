@@ -130,7 +130,17 @@ class MaskEstimatorModel(pt.Model):
         for idx, observation_abs in enumerate(batch[K.OBSERVATION_ABS]):
             if K.OBSERVATION_STFT in batch:
                 power_weights = np.abs(batch[K.OBSERVATION_STFT][idx]) ** 2
-                power_weights = observation_abs.new(power_weights)
+                # np.abs(...) ** 2 is already a new contiguous array, hence
+                # from_numpy shares its memory, and the conversion to the
+                # dtype of the observation is done by the same call as the
+                # device transfer.
+                power_weights = torch.from_numpy(
+                    np.ascontiguousarray(power_weights)
+                ).to(
+                    device=observation_abs.device,
+                    dtype=observation_abs.dtype,
+                    non_blocking=True,
+                )
             if K.SPEECH_MASK_TARGET in batch:
                 speech_mask_target = batch[K.SPEECH_MASK_TARGET][idx]
             else:
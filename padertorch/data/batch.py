@@ -44,7 +44,9 @@ def example_to_device(example, device=None):
             for element in example
         ])
     elif torch.is_tensor(example):
-        return example.to(device=device)
+        # Copies from pinned memory (e.g. DataLoader(pin_memory=True)) can be
+        # asynchronous. Pageable memory is copied synchronously anyway.
+        return example.to(device=device, non_blocking=example.is_pinned())
     elif isinstance(example, np.ndarray):
         if example.dtype in [np.complex64, np.complex128]:
             # complex is not supported
@@ -1,4 +1,5 @@
-import einops
+import math
+
 import torch
 from torch.nn.utils.rnn import PackedSequence
 
@@ -66,7 +67,8 @@ class MultiChannelPermutationInvariantTraining(pt.Model):
         # normalizes batch in-place, only one call for forward/review needed
 
         for b in range(len(observation)):
-            std = torch.sqrt(torch.mean(observation[b]**2))
+            # Same as sqrt(mean(x ** 2)), but without the temporary for x ** 2
+            std = torch.norm(observation[b]) / math.sqrt(observation[b].numel())
             observation[b] /= std
             if target is not None:
                 target[b] /= std
@@ -111,8 +113,9 @@ class MultiChannelPermutationInvariantTraining(pt.Model):
         h_data = self.output_activation(h_data)
         h = PackedSequence(h_data, h.batch_sizes)
 
+        # 'tb (k f) -> tb k f'
         mask = PackedSequence(
-            einops.rearrange(h.data, 'tb (k f) -> tb k f', k=self.K),
+            h.data.view(h.data.size(0), self.K, -1),
             h.batch_sizes,
         )
         return pt.ops.unpack_sequence(mask)
@@ -120,55 +123,43 @@ class MultiChannelPermutationInvariantTraining(pt.Model):
     def review(self, batch, model_out):
         # TODO: Maybe calculate only one loss? May be much faster.
         pit_mse_loss = list()
+        pit_ips_loss = list()
+        pit_ips_clean_loss = list()
+        binary_loss = list()
 
-        for mask, observation, target in zip(
+        # One pass over the examples for all losses, instead of one loop
+        # per loss.
+        for (
+                mask, observation, target, target_clean, cos_phase_diff,
+                target_mask
+        ) in zip(
                 model_out,
                 batch['Y_abs'],
-                batch['X_abs']
+                batch['X_abs'],
+                batch['X_clean'],
+                batch['cos_phase_difference'],
+                batch['target_mask'],
         ):
-
+            # Shared by all magnitude losses
+            estimation = mask * observation[:, None, :]
             pit_mse_loss.append(pt.ops.losses.pit_loss(
-                mask * observation[:, None, :],
+                estimation,
                 target,
                 axis=-2
             ))
-
-        pit_ips_loss = list()
-        for mask, observation, target, cos_phase_diff in zip(
-                model_out,
-                batch['Y_abs'],
-                batch['X_abs'],
-                batch['cos_phase_difference']
-        ):
-            estimation = mask * observation[:, None, :]
             pit_ips_loss.append(pt.ops.losses.pit_loss(
                 estimation,
                 target * cos_phase_diff,
                 axis=-2
             ))
-
-        pit_ips_clean_loss = list()
-        for mask, observation, target, cos_phase_diff in zip(
-                model_out,
-                batch['Y_abs'],
-                batch['X_clean'],
-                batch['cos_phase_difference']
-        ):
-            estimation = mask * observation[:, None, :]
             pit_ips_clean_loss.append(pt.ops.losses.pit_loss(
                 estimation,
-                target * cos_phase_diff,
+                target_clean * cos_phase_diff,
                 axis=-2
             ))
-
-        binary_loss = list()
-        for mask, target in zip(
-                model_out,
-                batch['target_mask'],
-        ):
             binary_loss.append(pt.ops.losses.pit_loss(
                 mask,
-                target,
+                target_mask.to(mask.dtype),
                 axis=-2
             ))
 
@@ -179,19 +170,30 @@ class MultiChannelPermutationInvariantTraining(pt.Model):
             'binary_loss': torch.mean(torch.stack(binary_loss)),
         }
 
+        # The images are only rendered in modify_summary, i.e. once per
+        # summary and not for every review.
         b = 0
         images = dict()
-        images['observation'] = stft_to_image(batch['Y_abs'][b])
+        images['observation'] = batch['Y_abs'][b].detach()
         for i in range(model_out[b].shape[1]):
-            images[f'mask_{i}'] = mask_to_image(model_out[b][:, i, :])
-            images[f'target_{i}'] = stft_to_image(batch['X_abs'][b][:, i, :])
-            images[f'estimation_{i}'] = stft_to_image(
-                batch['Y_abs'][b]*model_out[b][:, i, :])
+            images[f'mask_{i}'] = model_out[b][:, i, :].detach()
+            images[f'target_{i}'] = batch['X_abs'][b][:, i, :].detach()
+            images[f'estimation_{i}'] = (
+                batch['Y_abs'][b]*model_out[b][:, i, :]).detach()
 
         return dict(losses=losses,
                     images=images
                     )
 
+    def modify_summary(self, summary):
+        for key, image in summary['images'].items():
+            if key.startswith('mask_'):
+                summary['images'][key] = mask_to_image(image)
+            else:
+                summary['images'][key] = stft_to_image(image)
+        summary = super().modify_summary(summary)
+        return summary
+
 
 class DeepClusteringModel(pt.Model):
     def __init__(
@@ -252,7 +254,8 @@ class DeepClusteringModel(pt.Model):
         h, _ = self.blstm(h)
 
         h = PackedSequence(self.linear(h.data), h.batch_sizes)
-        h_data = einops.rearrange(h.data, 'tb (e f) -> tb e f', e=self.E)
+        # 'tb (e f) -> tb e f'
+        h_data = h.data.view(h.data.size(0), self.E, -1)
 
         # Hershey 2016 page 2 top right paragraph: Unit norm
         h_data = torch.nn.functional.normalize(h_data, dim=-2)
@@ -264,9 +267,11 @@ class DeepClusteringModel(pt.Model):
     def review(self, batch, model_out):
         dc_loss = list()
         for embedding, target_mask in zip(model_out, batch['target_mask']):
+            # 't e f -> (t f) e' and 't k f -> (t f) k'
             dc_loss.append(pt.ops.losses.deep_clustering_loss(
-                einops.rearrange(embedding, 't e f -> (t f) e'),
-                einops.rearrange(target_mask, 't k f -> (t f) k')
+                embedding.transpose(1, 2).reshape(-1, embedding.size(1)),
+                target_mask.transpose(1, 2).reshape(
+                    -1, target_mask.size(1)).to(embedding.dtype),
             ))
 
         return {'losses': {'dc_loss': torch.mean(torch.stack(dc_loss))}}
@@ -106,6 +106,27 @@ class STFT:
         self.stft_kernel = get_stft_kernel(size, window)
         self.istft_kernel_real, self.istft_kernel_imag = get_istft_kernel(
             size, shift, window)
+        # Copies of the kernels on the devices and dtypes of the inputs, see
+        # _get_kernel.
+        self._kernel_cache = {}
+
+    def _get_kernel(self, name, x):
+        """
+        Returns the kernel `name` (e.g. 'stft_kernel') on the device and with
+        the dtype of `x`.
+
+        The copies are cached, so that the kernel is not copied for each call.
+        The original kernels are never modified, i.e. they keep their
+        precision and the STFT can be shared between threads (e.g. the
+        replicas of data parallel).
+        """
+        key = (name, x.device, x.dtype)
+        try:
+            return self._kernel_cache[key]
+        except KeyError:
+            kernel = getattr(self, name).to(x)
+            self._kernel_cache[key] = kernel
+            return kernel
 
     def __call__(self, inputs):
         """
@@ -153,8 +174,8 @@ class STFT:
                 x = F.pad(x, (0, pad_size))
 
         x = torch.unsqueeze(x, 1) # [..., 1, T]
-        weights = self.stft_kernel.to(x)
-        encoded = F.conv1d(x, weight=weights, stride=stride)
+        stft_kernel = self._get_kernel('stft_kernel', x)
+        encoded = F.conv1d(x, weight=stft_kernel, stride=stride)
 
         encoded = encoded.view(*org_shape[:-1], *encoded.shape[-2:])
         encoded = rearrange(encoded, '... feat frames -> ... frames feat')
@@ -214,12 +235,12 @@ class STFT:
             [signal_real, signal_real[:, 1:-1].flip(1)], dim=1)
         signal_imag = torch.cat(
             [signal_imag, -signal_imag[:, 1:-1].flip(1)], dim=1)
-        kernel_real = self.istft_kernel_real.to(signal_real)
-        decoded_real = F.conv_transpose1d(signal_real, weight=kernel_real,
-                                          stride=self.shift)
-        kernel_imag = self.istft_kernel_imag.to(signal_imag)
-        decoded_imag = F.conv_transpose1d(signal_imag, kernel_imag,
-                                          stride=self.shift)
+        istft_kernel_real = self._get_kernel('istft_kernel_real', signal_real)
+        decoded_real = F.conv_transpose1d(
+            signal_real, weight=istft_kernel_real, stride=self.shift)
+        istft_kernel_imag = self._get_kernel('istft_kernel_imag', signal_imag)
+        decoded_imag = F.conv_transpose1d(
+            signal_imag, istft_kernel_imag, stride=self.shift)
         time_signal = decoded_real + decoded_imag
         time_signal = time_signal.view(*org_shape[:-2], time_signal.shape[-1])
         if self.fading not in [None, False]:
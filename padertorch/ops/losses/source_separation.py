@@ -1,3 +1,4 @@
+import functools
 import torch
 import torch.nn.functional
 import itertools
@@ -31,6 +32,13 @@ def deep_clustering_loss(x, t):
     ) / N ** 2
 
 
+@functools.lru_cache()
+def _permutations(sources):
+    # The permutations only depend on the number of sources, hence enumerate
+    # them only once for each number of sources.
+    return tuple(itertools.permutations(range(sources)))
+
+
 def pit_loss(
         estimate: torch.Tensor,
         target: torch.Tensor,
@@ -107,7 +115,7 @@ def pit_loss(
         )
     candidates = []
     filler = (slice(None),) * axis
-    permutations = list(itertools.permutations(range(sources)))
+    permutations = _permutations(sources)
     for permutation in permutations:
         candidates.append(loss_fn(
             estimate[filler + (permutation, )],
@@ -15,9 +15,11 @@ __all__ = [
 
 
 def _remove_batch_axis(array, batch_first, ndim=2):
-    if array.ndim == ndim:
+    # Works for numpy arrays and torch tensors, so that the batch axis can be
+    # removed before the tensor is copied to the host.
+    if len(array.shape) == ndim:
         pass
-    elif array.ndim == ndim + 1:
+    elif len(array.shape) == ndim + 1:
         if batch_first:
             array = array[0]
         else:
@@ -38,14 +40,23 @@ def mask_to_image(mask, batch_first=False):
     Returns: Shape(color, features, frames)
 
     """
-    mask = to_numpy(mask, detach=True)
-
-    image = np.clip(mask * 255, 0, 255)
-    image = image.astype(np.uint8)
-
-    image = _remove_batch_axis(image, batch_first=batch_first)
+    mask = _remove_batch_axis(mask, batch_first=batch_first)
+
+    if torch.is_tensor(mask):
+        # Quantize on the device, so that only uint8 values are copied to
+        # the host.
+        image = mask.detach().mul(255).clamp_(0, 255).to(torch.uint8)
+        # torch.flip copies, hence the returned array is contiguous.
+        # .numpy() instead of to_numpy, which returns a read-only array, to
+        # return a writeable array as in the numpy branch.
+        return image.t().flip(0)[None].cpu().numpy()
+    else:
+        mask = to_numpy(mask)
+        image = mask * 255
+        np.clip(image, 0, 255, out=image)
+        image = image.astype(np.uint8)
 
-    return image[None].transpose(0, 2, 1)[:, ::-1]
+        return np.ascontiguousarray(image[None].transpose(0, 2, 1)[:, ::-1])
 
 
 def stft_to_image(signal, batch_first=False, color='viridis'):
@@ -58,11 +69,26 @@ def stft_to_image(signal, batch_first=False, color='viridis'):
     Returns: Shape(features, frames)
 
     """
-    signal = to_numpy(signal, detach=True)
+    if not (torch.is_tensor(signal) and signal.is_floating_point()):
+        signal = to_numpy(signal, detach=True)
+
+    if torch.is_tensor(signal) or not np.iscomplexobj(signal):
+        # For real input max(abs(x)) == max(max(x), -min(x)), i.e. the
+        # magnitude has to be computed (and copied) only for the first
+        # example.
+        maximum = max(float(signal.max()), -float(signal.min()))
+        signal = _remove_batch_axis(signal, batch_first=batch_first)
+        signal = np.abs(to_numpy(signal, detach=True))
+    else:
+        signal = np.abs(signal)
+        maximum = np.max(signal)
+        signal = _remove_batch_axis(signal, batch_first=batch_first)
+
+    # np.abs returns a new array, hence it can be normalized in place
+    # instead of allocating another temporary in spectrogram_to_image.
+    signal /= maximum + np.finfo(signal.dtype).tiny
 
-    return spectrogram_to_image(
-        np.abs(signal), batch_first=batch_first, color=color
-    )
+    return _normalized_spectrogram_to_image(signal, color=color)
 
 
 _spectrogram_to_image_cmap = {}
@@ -80,22 +106,45 @@ def spectrogram_to_image(signal, batch_first=False, color='viridis'):
 
     Returns: Shape(features, frames)
     """
+    # Normalize with the maximum of all examples, but copy only the first
+    # example to the host.
+    if not torch.is_tensor(signal):
+        signal = np.asarray(signal)
+    maximum = float(signal.max())
+    signal = _remove_batch_axis(signal, batch_first=batch_first)
     signal = to_numpy(signal, detach=True)
 
-    signal = signal / (np.max(signal) + np.finfo(signal.dtype).tiny)
+    # The division allocates the only float temporary (the input may be
+    # read-only), all following operations work in place on it.
+    signal = signal / (maximum + np.finfo(signal.dtype).tiny)
 
-    signal = _remove_batch_axis(signal, batch_first=batch_first)
+    return _normalized_spectrogram_to_image(signal, color=color)
 
+
+def _normalized_spectrogram_to_image(signal, color='viridis'):
+    """
+    In-place part of spectrogram_to_image.
+
+    Args:
+        signal: Writeable float array with shape (frames, features) that is
+            already normalized to a maximum of one. Will be overwritten.
+        color: See spectrogram_to_image.
+
+    Returns: Shape(features, frames)
+    """
     visible_dB = 50
 
     # remove problematic small numbers
     floor = 10 ** (-visible_dB / 20)
-    signal = np.maximum(signal, floor)
+    np.maximum(signal, floor, out=signal)
 
     # Scale such that X dB are visible (i.e. in the range 0 to 1)
-    signal = (20 / visible_dB) * np.log10(signal) + 1
+    np.log10(signal, out=signal)
+    signal *= 20 / visible_dB
+    signal += 1
 
-    signal = (signal * 255).astype(np.uint8)
+    signal *= 255
+    signal = signal.astype(np.uint8)
 
     if color is not None:
         try:
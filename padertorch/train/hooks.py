@@ -8,8 +8,10 @@ E.g., adding a learning rate schedule without adding further conditions to the
 trainer.
 
 """
+import functools
+import os
 import types
-from collections import defaultdict
+from collections import defaultdict, deque
 from enum import IntEnum
 from pathlib import Path
 
@@ -61,9 +63,7 @@ class Priority(IntEnum):
 
 
 class Hook:
-    @property
-    def priority(self):
-        return Priority.DEFAULT
+    priority = Priority.DEFAULT
 
     @property
     def uid(self):
@@ -170,9 +170,7 @@ class SummaryHook(TriggeredHook):
         self.reset_summary()
         self.summary_prefix = summary_prefix
 
-    @property
-    def priority(self):
-        return Priority.SUMMARY
+    priority = Priority.SUMMARY
 
     @staticmethod
     def empty_summary_dict():
@@ -181,7 +179,9 @@ class SummaryHook(TriggeredHook):
         return types.MappingProxyType(dict(
             # losses=defaultdict(list),
             scalars=defaultdict(list),
-            histograms=defaultdict(list),
+            # do not hold more than 1M values in memory
+            # (partial instead of lambda, to keep the summary picklable)
+            histograms=defaultdict(functools.partial(deque, maxlen=1000000)),
             audios=dict(),
             images=dict(),
             texts=dict(),
@@ -216,12 +216,22 @@ class SummaryHook(TriggeredHook):
 
         # note item is the pytorch function to get the value of a tensor
         for key, scalars in popped_review.pop('scalars', dict()).items():
-            self.summary['scalars'][key].extend(self._to_list(scalars))
+            if torch.is_tensor(scalars) and scalars.dim() == 0:
+                # Keep scalar tensors on their device and convert them in
+                # finalize_summary, to avoid a device sync for each review.
+                # Larger tensors (e.g. framewise predictions) are copied to
+                # the host immediately, so that they do not accumulate in the
+                # device memory (e.g. for a long validation).
+                # The clone releases the storage of the tensor, from which
+                # the scalar may be a view.
+                self.summary['scalars'][key].append(
+                    scalars.detach().reshape(1).clone())
+            else:
+                self.summary['scalars'][key].extend(self._to_list(scalars))
         for key, histogram in popped_review.pop('histograms', dict()).items():
+            # The deque drops the oldest values, instead of copying the
+            # last 1M values of a list for every review.
             self.summary['histograms'][key].extend(self._to_list(histogram))
-            # do not hold more than 1M values in memory
-            self.summary['histograms'][key] = \
-                self.summary['histograms'][key][-1000000:]
         for key, buffer in popped_review.pop('buffers', dict()).items():
             self.summary['buffers'][key].append(self._detach(buffer))
         for key, snapshot in popped_review.pop('snapshots', dict()).items():
@@ -241,7 +251,9 @@ class SummaryHook(TriggeredHook):
     @staticmethod
     def _to_list(scalars):
         if torch.is_tensor(scalars):
-            scalars = scalars.clone().cpu().data.numpy()
+            # .cpu() already copies cuda tensors and .flatten().tolist()
+            # copies the data in any case, hence no clone is necessary.
+            scalars = scalars.detach().cpu().numpy()
         if isinstance(scalars, np.ndarray):
             scalars = scalars.flatten().tolist()
         if not isinstance(scalars, (list, tuple)):
@@ -249,12 +261,43 @@ class SummaryHook(TriggeredHook):
             scalars = [scalars]
         return scalars
 
+    @classmethod
+    def _scalars_to_list(cls, scalars):
+        if len(scalars) > 0 and all(torch.is_tensor(s) for s in scalars) \
+                and len({(s.dtype, s.device) for s in scalars}) == 1:
+            # One device to host copy for all reviews
+            return cls._to_list(torch.cat(scalars))
+        return [value for s in scalars for value in cls._to_list(s)]
+
+    def _finalize_scalars(self):
+        # Converts the tensors that update_summary kept on the device. Has to
+        # be called before modify_summary and dump_summary.
+        for key, scalars in self.summary['scalars'].items():
+            self.summary['scalars'][key] = self._scalars_to_list(scalars)
+
+    def _finalize_histograms(self):
+        # modify_summary expects lists, not the deques of update_summary
+        for key, histogram in self.summary['histograms'].items():
+            self.summary['histograms'][key] = list(histogram)
+
     @staticmethod
     def _detach(buffer):
         if torch.is_tensor(buffer):
             buffer = buffer.detach()
         return buffer
 
+    @staticmethod
+    def _audio_and_sample_rate(audio):
+        """
+        Normalizes an audio summary value to an `(audio data, sample rate)`
+        tuple. The sample rate defaults to 16k, if it is not given.
+        """
+        if isinstance(audio, (tuple, list)):
+            assert len(audio) == 2, (len(audio), audio)
+            return tuple(audio)
+        else:
+            return audio, 16000
+
     def compute_timings(self, timer: 'pt.trainer.ContextTimerDict'):
         timer_dict = timer.as_dict
         # Special handling for time_per_data_loading and time_per_train_step
@@ -298,6 +341,8 @@ class SummaryHook(TriggeredHook):
 
         for key, timing in self.compute_timings(trainer.train_timer).items():
             self.summary['timings'][key] = timing
+        self._finalize_scalars()
+        self._finalize_histograms()
         self.summary = trainer.model.modify_summary(self.summary)
         # Assert the intermediate types were converted in he modify summary
         assert len(self.summary['buffers']) == 0, "intermediate format buffers has to be converted during modify_summary"
@@ -306,6 +351,8 @@ class SummaryHook(TriggeredHook):
     def dump_summary(self, trainer: 'pt.Trainer'):
         iteration = trainer.iteration
         prefix = self.summary_prefix
+        # Resolve the writer once instead of for each written value
+        writer = trainer.writer
 
         time_prefix = f'{prefix}_timings'
 
@@ -329,33 +376,26 @@ class SummaryHook(TriggeredHook):
 
         for key, scalar in self.summary['scalars'].items():
             tag = check_tag(f'{prefix}/{key}')
-            trainer.writer.add_scalar(tag, scalar, iteration)
+            writer.add_scalar(tag, scalar, iteration)
         for key, scalar in self.summary['timings'].items():
             tag = check_tag(f'{time_prefix}/{key}')
-            trainer.writer.add_scalar(tag, scalar.mean(), iteration)
+            writer.add_scalar(tag, scalar.mean(), iteration)
         for key, histogram in self.summary['histograms'].items():
             tag = check_tag(f'{prefix}/{key}')
-            trainer.writer.add_histogram(tag, np.array(histogram), iteration)
+            writer.add_histogram(tag, np.array(histogram), iteration)
         for key, audio in self.summary['audios'].items():
             tag = check_tag(f'{prefix}/{key}')
-            if isinstance(audio, (tuple, list)):
-                assert len(audio) == 2, (len(audio), audio)
-                trainer.writer.add_audio(
-                    tag, audio[0], iteration, sample_rate=audio[1]
-                )
-            else:
-                trainer.writer.add_audio(
-                    tag, audio, iteration, sample_rate=16000
-                )
+            audio, sample_rate = self._audio_and_sample_rate(audio)
+            writer.add_audio(tag, audio, iteration, sample_rate=sample_rate)
         for key, image in self.summary['images'].items():
             tag = check_tag(f'{prefix}/{key}')
-            trainer.writer.add_image(tag, image, iteration)
+            writer.add_image(tag, image, iteration)
         for key, text in self.summary['texts'].items():
             tag = check_tag(f'{prefix}/{key}')
-            trainer.writer.add_text(tag, text, iteration)
+            writer.add_text(tag, text, iteration)
         for key, figure in self.summary['figures'].items():
             tag = check_tag(f'{prefix}/{key}')
-            trainer.writer.add_figure(tag, figure, iteration)
+            writer.add_figure(tag, figure, iteration)
 
         self.reset_summary()
 
@@ -386,9 +426,13 @@ class SummaryHook(TriggeredHook):
 class CheckpointHook(TriggeredHook):
     """ Periodically saves trainer state to a checkpoint
     """
-    @property
-    def priority(self):
-        return Priority.CHECKPOINT
+    def __init__(self, trigger=None):
+        super().__init__(trigger)
+        # (iteration, digest of the checkpoint) of the last checkpoint, as
+        # long as the model was not trained since then.
+        self._saved_state = None
+
+    priority = Priority.CHECKPOINT
 
     def _save_latest_checkpoint(self, trainer: 'pt.Trainer'):
         """ Unconditionally save a checkpoint for the current model.
@@ -396,14 +440,30 @@ class CheckpointHook(TriggeredHook):
         """
         checkpoint_path: Path = trainer.default_checkpoint_path()
         checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
-        trainer.save_checkpoint()
+        digest = trainer.save_checkpoint()
+        self._saved_state = (trainer.iteration, digest)
 
     def pre_step(self, trainer: 'pt.Trainer'):
         if self.trigger(iteration=trainer.iteration, epoch=trainer.epoch):
             self._save_latest_checkpoint(trainer)
 
+    def post_step(self, trainer: 'pt.Trainer', example, model_output,
+                  review):
+        # The model may change after the first train step of an iteration.
+        self._saved_state = None
+
     def close(self, trainer):
-        self._save_latest_checkpoint(trainer)
+        # When the training stops in pre_step right after a checkpoint was
+        # written (e.g. by the StopTrainingHook), the checkpoint is still
+        # up to date, unless a hook changed its state in between.
+        # Serializing the state for the comparison is only necessary, when
+        # there was no train step since the last checkpoint.
+        if (
+                self._saved_state is None
+                or self._saved_state[0] != trainer.iteration
+                or self._saved_state[1] != trainer.state_dict_digest()
+        ):
+            self._save_latest_checkpoint(trainer)
 
     def set_last(self, iteration, epoch):
         if self.trigger.last[0] > iteration:
@@ -453,9 +513,7 @@ class ValidationHook(SummaryHook):
         self.n_degradations = 0
         self.last_validation = -1
 
-    @property
-    def priority(self):
-        return Priority.VALIDATION
+    priority = Priority.VALIDATION
 
     @property
     def _best_ckpt_name(self):
@@ -478,6 +536,8 @@ class ValidationHook(SummaryHook):
         assert len(self.summary['timings']) == 0, self.summary['timings']
         for key, timing in self.compute_timings(trainer.validate_timer).items():
             self.summary['timings'][key] = timing
+        self._finalize_scalars()
+        self._finalize_histograms()
         try:
             self.summary = trainer.model.modify_summary(self.summary)
         except Exception as e:
@@ -574,6 +634,9 @@ class ValidationHook(SummaryHook):
     def set_best_symlink(self, ckpt_dir):
         best_ckpt_path = ckpt_dir / self._best_ckpt_name
         if best_ckpt_path.is_symlink():
+            if os.readlink(str(best_ckpt_path)) == self.ckpt_ranking[0][0]:
+                # The best checkpoint did not change
+                return
             best_ckpt_path.unlink()
         best_ckpt_path.symlink_to(self.ckpt_ranking[0][0])
 
@@ -782,9 +845,7 @@ class ProgressBarHook(TriggeredHook):
         #     you resume an experiment (start value is one and the first step
         #     is to the value of the iteration counter).
 
-    @property
-    def priority(self):
-        return Priority.PROGRESS
+    priority = Priority.PROGRESS
 
     def set_last(self, iteration, epoch):
         super().set_last(iteration, epoch)
@@ -813,9 +874,7 @@ class StopTrainingHook(TriggeredHook):
     def __init__(self, trigger):
         super().__init__(EndTrigger.new(trigger))
 
-    @property
-    def priority(self):
-        return Priority.END
+    priority = Priority.END
 
     def pre_step(self, trainer):
         if self.trigger(trainer.iteration, trainer.epoch):
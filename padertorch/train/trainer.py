@@ -3,7 +3,10 @@
     configurable padertorch models.
 """
 import contextlib
+import hashlib
+import io
 import itertools
+import os
 import time
 from collections import defaultdict
 from datetime import datetime
@@ -555,7 +558,9 @@ class Trainer(Configurable):
                 weight = loss_weights[key] if loss_weights is not None else 1.
                 if weight != 0:
                     loss = loss + (weight * value)
-                review['scalars'][key] = value.item()
+                # Detached tensors, the SummaryHook converts them all at once
+                # when the summary is finalized.
+                review['scalars'][key] = value.detach()
                 review['scalars'][f'{key}_loss_weight'] = weight
             del review['losses']
             # review['loss'] = loss
@@ -563,7 +568,7 @@ class Trainer(Configurable):
             assert 'loss' in review, review
             loss = review.pop('loss')
 
-        review['scalars']['loss'] = loss.item()
+        review['scalars']['loss'] = loss.detach()
 
         assert loss.dim() == 0, loss
 
@@ -724,23 +729,44 @@ class Trainer(Configurable):
                     state_dict['hooks'][hook.uid] = hook_state
         return state_dict
 
+    def _serialized_state_dict(self):
+        buffer = io.BytesIO()
+        torch.save(self.state_dict(), buffer)
+        return buffer
+
+    def state_dict_digest(self):
+        """
+        The sha1 digest of the serialized state_dict, i.e. the same digest as
+        returned by save_checkpoint, as long as the state did not change.
+        """
+        return hashlib.sha1(self._serialized_state_dict().getbuffer()).digest()
+
     def save_checkpoint(self, checkpoint_path=None):
+        """
+        Returns:
+            The sha1 digest of the written checkpoint (see state_dict_digest).
+        """
         if checkpoint_path is None:
             checkpoint_path = self.default_checkpoint_path()
 
-        torch.save(
-            self.state_dict(),
-            str(checkpoint_path)
-        )
+        # Serialize into memory and write the file with a single call,
+        # instead of the many small writes of torch.save on a file.
+        buffer = self._serialized_state_dict()
+        with open(checkpoint_path, 'wb') as fd:
+            fd.write(buffer.getbuffer())
 
         # Create relative symlink to latest checkpoint
         latest_symlink_path = (checkpoint_path.parent / f'ckpt_latest.pth').absolute()
         if latest_symlink_path.is_symlink():
-            latest_symlink_path.unlink()
-        latest_symlink_path.symlink_to(checkpoint_path.name)
+            if os.readlink(str(latest_symlink_path)) != checkpoint_path.name:
+                latest_symlink_path.unlink()
+                latest_symlink_path.symlink_to(checkpoint_path.name)
+        else:
+            latest_symlink_path.symlink_to(checkpoint_path.name)
 
         print(f"{datetime.now()}: Saved model and optimizer state "
               f"at iteration {self.iteration} to {checkpoint_path}")
+        return hashlib.sha1(buffer.getbuffer()).digest()
 
     def load_state_dict(self, state_dict):
         self.model.load_state_dict(state_dict['model'])
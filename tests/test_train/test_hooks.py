@@ -396,3 +396,98 @@ def test_LRSchedulerHook():
         hook.pre_step(trainer)
     assert lr_scheduler.calls_iteration == [0, 2, 4, 6, 8, 10]
     assert lr_scheduler.calls_epoch == [0, 0, 1, 2, 2, 3]
+
+
+class DummyCheckpointTrainer:
+    """Records the iterations of save_checkpoint instead of writing files."""
+    epoch = 0
+    model = None
+
+    def __init__(self, checkpoint_dir, hooks):
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.hooks = hooks
+        self.iteration = 0
+        self.saved = []
+
+    def default_checkpoint_path(self):
+        return self.checkpoint_dir / f'ckpt_{self.iteration}.pth'
+
+    def state_dict(self):
+        return {
+            'iteration': self.iteration,
+            'hooks': [hook.state_dict() for hook in self.hooks],
+        }
+
+    _serialized_state_dict = pt.Trainer._serialized_state_dict
+    state_dict_digest = pt.Trainer.state_dict_digest
+
+    def save_checkpoint(self):
+        self.saved.append(self.iteration)
+        return self.state_dict_digest()
+
+    def close(self):
+        # Same order as in Trainer.train
+        for hook in sorted(self.hooks, key=lambda h: h.priority, reverse=True):
+            hook.close(self)
+
+
+class ArrayStateHook(pt.train.hooks.Hook):
+    def state_dict(self):
+        return {'weights': np.ones(3)}
+
+
+def test_checkpoint_hook_stop_after_checkpoint():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        checkpoint_hook = pt.train.hooks.CheckpointHook((2, 'iteration'))
+        trainer = DummyCheckpointTrainer(
+            Path(tmp_dir) / 'checkpoints',
+            [checkpoint_hook, ArrayStateHook()],
+        )
+        for iteration in range(3):
+            trainer.iteration = iteration
+            checkpoint_hook.pre_step(trainer)
+            if iteration < 2:
+                checkpoint_hook.post_step(trainer, None, None, None)
+        assert trainer.saved == [0, 2]
+
+        # The training stopped in pre_step right after the checkpoint of
+        # iteration 2, hence this checkpoint is still up to date.
+        trainer.close()
+        assert trainer.saved == [0, 2]
+
+
+def test_checkpoint_hook_close_after_train_step():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        checkpoint_hook = pt.train.hooks.CheckpointHook((2, 'iteration'))
+        trainer = DummyCheckpointTrainer(
+            Path(tmp_dir) / 'checkpoints', [checkpoint_hook],
+        )
+        checkpoint_hook.pre_step(trainer)
+        checkpoint_hook.post_step(trainer, None, None, None)
+        assert trainer.saved == [0]
+
+        # The model was trained after the checkpoint.
+        trainer.close()
+        assert trainer.saved == [0, 0]
+
+
+def test_checkpoint_hook_close_after_validation_ranking_update():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        checkpoint_hook = pt.train.hooks.CheckpointHook((2, 'iteration'))
+        validation_hook = pt.train.hooks.ValidationHook((4, 'iteration'), [])
+        validation_hook.ckpt_ranking = [('ckpt_0.pth', 1.)]
+        trainer = DummyCheckpointTrainer(
+            Path(tmp_dir) / 'checkpoints', [checkpoint_hook, validation_hook],
+        )
+        trainer.iteration = 2
+        checkpoint_hook.pre_step(trainer)
+        assert trainer.saved == [2]
+
+        # There was no validation for ckpt_2.pth, hence ValidationHook.close
+        # adds it to the ranking and the checkpoint has to be written again
+        # to contain the new ranking.
+        trainer.close()
+        assert validation_hook.ckpt_ranking == [
+            ('ckpt_0.pth', 1.), ('ckpt_2.pth', np.inf)
+        ]
+        assert trainer.saved == [2, 2]